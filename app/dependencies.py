@@ -0,0 +1,81 @@
+"""Lazily constructed service singletons shared by the routers.
+
+Service modules (and the Slack, OpenAI, Notion and Google SDKs they import)
+are only loaded the first time a request needs them, so importing
+``app.main`` stays fast and does not touch the network.
+"""
+import functools
+import os
+import threading
+
+_lock = threading.RLock()
+
+
+def _singleton(factory):
+    """Build the factory's result once, on first call, and reuse it afterwards."""
+    instance = None
+
+    @functools.wraps(factory)
+    def get():
+        nonlocal instance
+        if instance is None:
+            with _lock:
+                if instance is None:
+                    instance = factory()
+        return instance
+
+    get.is_loaded = lambda: instance is not None
+    return get
+
+
+@_singleton
+def get_transcript_service():
+    from .services.transcript_service import TranscriptService
+
+    client = None
+    token = os.getenv("SLACK_BOT_TOKEN")
+    if token:
+        from slack_sdk import WebClient
+        client = WebClient(token=token)
+    return TranscriptService(client)
+
+
+@_singleton
+def get_openai_service():
+    from .services.openai_service import OpenAIService
+    return OpenAIService(transcript_service=get_transcript_service())
+
+
+@_singleton
+def get_slack_service():
+    from .services.slack_service import SlackService
+    return SlackService(openai_service=get_openai_service())
+
+
+@_singleton
+def get_notion_service():
+    from .services.notion_service import NotionService
+    return NotionService()
+
+
+@_singleton
+def get_calendar_service():
+    from .services.calendar_service import CalendarService
+    return CalendarService()
+
+
+def init_services():
+    """Eagerly build every service (used when PRELOAD_SERVICES is enabled)."""
+    get_slack_service()
+    get_notion_service()
+    # Touch the client so the discovery fetch and token refresh happen now
+    get_calendar_service().service
+
+
+async def close_services():
+    """Release network clients held by services that were actually built."""
+    if get_slack_service.is_loaded():
+        # Flush queued replies before the process exits
+        await get_slack_service().dispatcher.close()
+    if get_openai_service.is_loaded():
+        await get_openai_service().close()
@@ -1,38 +1,28 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Depends, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from slack_bolt import App
-from slack_bolt.adapter.fastapi import SlackRequestHandler
+from contextlib import asynccontextmanager
+import asyncio
 import os
 from dotenv import load_dotenv
 from pathlib import Path
-from .services import slack_service, notion_service, calendar_service, openai_service
+from .dependencies import close_services, get_openai_service, get_slack_service, init_services
 from .routers import slack, api
-from fastapi.responses import JSONResponse
-from .services.slack_service import SlackService
-from .services.openai_service import OpenAIService
 from pydantic import BaseModel
 from typing import List, Dict
 
-# Get the absolute path to the .env file
-env_path = Path('.') / '.env'
-print(f"Looking for .env file at: {env_path.absolute()}")
+# Load environment variables once; services read them when first built
+load_dotenv(dotenv_path=Path('.') / '.env')
 
-# Load environment variables
-load_dotenv(dotenv_path=env_path)
-
-# Debug: Print environment variables (remove in production)
-print("Current working directory:", os.getcwd())
-print("SLACK_BOT_TOKEN:", os.getenv("SLACK_BOT_TOKEN"))
-print("SLACK_SIGNING_SECRET:", os.getenv("SLACK_SIGNING_SECRET"))
-
-# Verify required environment variables
-if not os.getenv("SLACK_BOT_TOKEN"):
-    raise ValueError("SLACK_BOT_TOKEN environment variable is not set")
-if not os.getenv("SLACK_SIGNING_SECRET"):
-    raise ValueError("SLACK_SIGNING_SECRET environment variable is not set")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Optionally warm up services at startup and release their clients at shutdown."""
+    if os.getenv("PRELOAD_SERVICES", "false").lower() == "true":
+        await asyncio.to_thread(init_services)
+    yield
+    await close_services()
 
 # Initialize FastAPI app
-app = FastAPI(title="AI Slack Agent")
+app = FastAPI(title="AI Slack Agent", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -43,23 +33,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Slack app with explicit token
-slack_token = os.getenv("SLACK_BOT_TOKEN")
-if not slack_token:
-    raise ValueError("SLACK_BOT_TOKEN is not set in environment variables")
-
-slack_app = App(
-    token=slack_token,
-    signing_secret=os.getenv("SLACK_SIGNING_SECRET")
-)
-
 # Include routers
 app.include_router(slack.router)
 app.include_router(api.router)
 
-slack_service = SlackService()
-openai_service = OpenAIService()
-
 class Conversation(BaseModel):
     conversation: List[Dict[str, str]]
 
@@ -80,12 +57,14 @@ async def slack_events(request: Request):
             return {"challenge": body.get("challenge")}
         
         # Handle other events
+        # First use imports the Slack/OpenAI SDKs and builds clients; keep that off the event loop
+        slack_service = await asyncio.to_thread(get_slack_service)
         return await slack_service.handler.handle(request)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/summarize")
-async def summarize_conversation(conversation: Conversation):
+async def summarize_conversation(conversation: Conversation, openai_service=Depends(get_openai_service)):
     """Summarize a conversation"""
     try:
         summary = await openai_service.summarize_conversation(conversation.conversation)
@@ -94,7 +73,7 @@ async def summarize_conversation(conversation: Conversation):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/action-items")
-async def extract_action_items(conversation: Conversation):
+async def extract_action_items(conversation: Conversation, openai_service=Depends(get_openai_service)):
     """Extract action items from a conversation"""
     try:
         action_items = await openai_service.extract_action_items(conversation.conversation)
@@ -103,7 +82,7 @@ async def extract_action_items(conversation: Conversation):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/digest")
-async def get_daily_digest():
+async def get_daily_digest(openai_service=Depends(get_openai_service)):
     """Generate daily digest"""
     try:
         # Mock content for testing
@@ -1,18 +1,39 @@
-from fastapi import APIRouter, HTTPException
-from ..services.slack_service import SlackService
-from ..services.notion_service import NotionService
-from ..services.calendar_service import CalendarService
-from ..services.openai_service import OpenAIService
-from typing import Dict, List
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from ..dependencies import (
+    get_calendar_service,
+    get_notion_service,
+    get_openai_service,
+    get_slack_service,
+    get_transcript_service
+)
+from typing import Any, Dict, List, Optional
+import json
 
 router = APIRouter(prefix="/api", tags=["api"])
-slack_service = SlackService()
-notion_service = NotionService()
-calendar_service = CalendarService()
-openai_service = OpenAIService()
+
+# Keep batch concurrency within the OpenAI client's connection pool (max 10)
+MAX_BATCH_SIZE = 500
+MAX_BATCH_CONCURRENCY = 10
+
+class BatchConversation(BaseModel):
+    id: Optional[str] = None
+    conversation: List[Dict] = Field(..., min_length=1)
+
+class BatchSummarizeRequest(BaseModel):
+    # Items are validated one by one so a malformed item does not fail the whole batch
+    conversations: List[Any] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+    concurrency: int = Field(5, ge=1, le=MAX_BATCH_CONCURRENCY)
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+        for err in error.errors()
+    )
 
 @router.post("/summarize")
-async def summarize_conversation(conversation: List[Dict]):
+async def summarize_conversation(conversation: List[Dict], openai_service=Depends(get_openai_service)):
     """Summarize a conversation."""
     try:
         summary = await openai_service.summarize_conversation(conversation)
@@ -20,8 +41,41 @@ async def summarize_conversation(conversation: List[Dict]):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/summarize/batch")
+async def summarize_conversations_batch(request: BatchSummarizeRequest, openai_service=Depends(get_openai_service)):
+    """Summarize many conversations, streaming NDJSON results as each one finishes."""
+    async def stream_results():
+        # Report invalid or empty items up front without spending an OpenAI call on them
+        valid = []
+        for index, raw_item in enumerate(request.conversations):
+            try:
+                valid.append((index, BatchConversation.model_validate(raw_item)))
+            except ValidationError as e:
+                item_id = raw_item.get("id") if isinstance(raw_item, dict) else None
+                result = {"index": index, "id": item_id, "error": _validation_message(e)}
+                yield json.dumps(result, default=str) + "\n"
+
+        results = openai_service.summarize_many(
+            [item.conversation for _, item in valid],
+            max_concurrency=request.concurrency
+        )
+        async for position, summary, error in results:
+            index, item = valid[position]
+            result = {"index": index, "id": item.id}
+            if error is None:
+                result["summary"] = summary
+            else:
+                result["error"] = error
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @router.post("/action-items")
-async def extract_action_items(conversation: List[Dict]):
+async def extract_action_items(
+    conversation: List[Dict],
+    openai_service=Depends(get_openai_service),
+    notion_service=Depends(get_notion_service)
+):
     """Extract and sync action items."""
     try:
         # Extract action items
@@ -40,7 +94,12 @@ async def extract_action_items(conversation: List[Dict]):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/digest")
-async def generate_daily_digest():
+async def generate_daily_digest(
+    openai_service=Depends(get_openai_service),
+    notion_service=Depends(get_notion_service),
+    calendar_service=Depends(get_calendar_service),
+    slack_service=Depends(get_slack_service)
+):
     """Generate daily digest."""
     try:
         # Get content from different services
@@ -62,4 +121,20 @@ async def generate_daily_digest():
         
         return {"digest": digest}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+@router.get("/metrics/slack-dispatcher")
+async def get_slack_dispatcher_metrics(slack_service=Depends(get_slack_service)):
+    """Outbound Slack queue depth, delivery counters and queue delay."""
+    return slack_service.dispatcher.get_metrics()
+
+@router.get("/metrics/transcripts")
+async def get_transcript_metrics(transcript_service=Depends(get_transcript_service)):
+    """Prompt tokens saved by transcript compaction."""
+    stats = transcript_service.stats
+    requests = stats["requests"]
+    return {
+        **stats,
+        "avg_tokens_saved": stats["tokens_saved"] / requests if requests else 0.0,
+        "cached_users": len(transcript_service.cache)
+    }
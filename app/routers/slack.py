@@ -1,14 +1,8 @@
+import asyncio
 from fastapi import APIRouter, Request, HTTPException
-from ..services.slack_service import SlackService
-from ..services.notion_service import NotionService
-from ..services.calendar_service import CalendarService
-from ..services.openai_service import OpenAIService
+from ..dependencies import get_slack_service
 
 router = APIRouter(prefix="/slack", tags=["slack"])
-slack_service = SlackService()
-notion_service = NotionService()
-calendar_service = CalendarService()
-openai_service = OpenAIService()
 
 @router.post("/events")
 async def handle_slack_events(request: Request):
@@ -21,15 +15,17 @@ async def handle_slack_events(request: Request):
             return {"challenge": body.get("challenge")}
         
         # Handle events
+        # First use imports the Slack/OpenAI SDKs and builds clients; keep that off the event loop
+        slack_service = await asyncio.to_thread(get_slack_service)
         event = body.get("event", {})
         event_type = event.get("type")
         
         if event_type == "message":
             # Handle message events
-            await slack_service.handle_message(event, slack_service.app.client.chat_postMessage)
+            await slack_service.handle_message(event)
         elif event_type == "app_mention":
             # Handle mentions
-            await slack_service.handle_mention(event, slack_service.app.client.chat_postMessage)
+            await slack_service.handle_mention(event)
         
         return {"status": "ok"}
     except Exception as e:
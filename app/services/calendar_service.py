@@ -1,7 +1,4 @@
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+import asyncio
 import os
 import pickle
 from datetime import datetime, timedelta
@@ -12,12 +9,33 @@ SCOPES = ['https://www.googleapis.com/auth/calendar']
 class CalendarService:
     def __init__(self):
         self.creds = None
-        self.service = None
-        self.initialize_service()
+        self._service = None
 
-    def initialize_service(self):
-        """Initialize the Google Calendar service."""
+    @property
+    def service(self):
+        """Google Calendar client, built on first use (blocking)."""
+        if self._service is None:
+            self.initialize_service()
+        return self._service
+
+    async def get_service(self):
+        """Google Calendar client, built on first use off the event loop."""
+        if self._service is None:
+            await asyncio.to_thread(self.initialize_service)
+        return self._service
+
+    def initialize_service(self, interactive: bool = False):
+        """Initialize the Google Calendar service.
+
+        The browser OAuth flow only runs when interactive is True (see the
+        __main__ block below); the server never starts it from a request.
+        """
         try:
+            # The Google SDKs are slow to import and build() fetches the discovery document
+            from google_auth_oauthlib.flow import InstalledAppFlow
+            from google.auth.transport.requests import Request
+            from googleapiclient.discovery import build
+
             if os.path.exists('token.pickle'):
                 with open('token.pickle', 'rb') as token:
                     self.creds = pickle.load(token)
@@ -25,6 +43,10 @@ class CalendarService:
             if not self.creds or not self.creds.valid:
                 if self.creds and self.creds.expired and self.creds.refresh_token:
                     self.creds.refresh(Request())
+                elif not interactive:
+                    raise RuntimeError(
+                        "Google Calendar is not authorized; run `python -m app.services.calendar_service` once"
+                    )
                 else:
                     flow = InstalledAppFlow.from_client_secrets_file(
                         'credentials.json', SCOPES)
@@ -33,7 +55,7 @@ class CalendarService:
                 with open('token.pickle', 'wb') as token:
                     pickle.dump(self.creds, token)
 
-            self.service = build('calendar', 'v3', credentials=self.creds)
+            self._service = build('calendar', 'v3', credentials=self.creds)
         except Exception as e:
             print(f"Error initializing calendar service: {str(e)}")
 
@@ -56,7 +78,8 @@ class CalendarService:
             if attendees:
                 event['attendees'] = [{'email': email} for email in attendees]
 
-            event = self.service.events().insert(calendarId='primary', body=event).execute()
+            service = await self.get_service()
+            event = service.events().insert(calendarId='primary', body=event).execute()
             return event
         except Exception as e:
             print(f"Error creating calendar event: {str(e)}")
@@ -68,7 +91,8 @@ class CalendarService:
             now = datetime.utcnow()
             end_of_day = now.replace(hour=23, minute=59, second=59)
 
-            events_result = self.service.events().list(
+            service = await self.get_service()
+            events_result = service.events().list(
                 calendarId='primary',
                 timeMin=now.isoformat() + 'Z',
                 timeMax=end_of_day.isoformat() + 'Z',
@@ -95,4 +119,8 @@ class CalendarService:
             return digest_content
         except Exception as e:
             print(f"Error getting calendar digest content: {str(e)}")
-            return "Unable to fetch calendar events." 
\ No newline at end of file
+            return "Unable to fetch calendar events." 
+
+if __name__ == "__main__":
+    # Run the interactive OAuth flow once to create token.pickle
+    CalendarService().initialize_service(interactive=True)
@@ -1,14 +1,12 @@
+import asyncio
 import os
 from openai import AsyncOpenAI
-from typing import List, Dict, Optional
-from dotenv import load_dotenv
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import httpx
-
-# Load environment variables
-load_dotenv()
+from .transcript_service import TranscriptService
 
 class OpenAIService:
-    def __init__(self):
+    def __init__(self, transcript_service: Optional[TranscriptService] = None):
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
@@ -24,36 +22,74 @@ class OpenAIService:
             api_key=api_key,
             http_client=http_client
         )
+        self.transcript_service = transcript_service or TranscriptService()
+
+    async def close(self):
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
+
+    async def _format_conversation(self, conversation: List[Dict]) -> str:
+        """Build a compact transcript of the conversation for the prompt."""
+        # Token savings are accumulated in transcript_service.stats
+        transcript = await self.transcript_service.build_transcript(conversation)
+        return transcript.text
+
+    async def _summarize(self, conversation: List[Dict]) -> str:
+        """Summarize a conversation, letting any OpenAI error propagate."""
+        # Format conversation for the API
+        formatted_conversation = await self._format_conversation(conversation)
+
+        response = await self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that summarizes conversations concisely."},
+                {"role": "user", "content": f"Please summarize this conversation:\n{formatted_conversation}"}
+            ]
+        )
+        content = response.choices[0].message.content
+        if content is None:
+            raise ValueError("OpenAI returned an empty summary")
+        return content
 
     async def summarize_conversation(self, conversation: List[Dict]) -> str:
         """Summarize a conversation using OpenAI."""
         try:
-            # Format conversation for the API
-            formatted_conversation = "\n".join([
-                f"{msg.get('user', 'Unknown')}: {msg.get('text', '')}"
-                for msg in conversation
-            ])
-
-            response = await self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that summarizes conversations concisely."},
-                    {"role": "user", "content": f"Please summarize this conversation:\n{formatted_conversation}"}
-                ]
-            )
-            content = response.choices[0].message.content
-            return content if content is not None else "Unable to summarize conversation."
+            return await self._summarize(conversation)
         except Exception as e:
             print(f"Error summarizing conversation: {str(e)}")
             return "Unable to summarize conversation."
 
+    async def summarize_many(
+        self, conversations: List[List[Dict]], max_concurrency: int = 5
+    ) -> AsyncIterator[Tuple[int, Optional[str], Optional[str]]]:
+        """Summarize many conversations concurrently.
+
+        Yields (index, summary, error) tuples in completion order; a failed
+        conversation yields its error message instead of aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def summarize(index: int, conversation: List[Dict]):
+            async with semaphore:
+                try:
+                    return index, await self._summarize(conversation), None
+                except Exception as e:
+                    print(f"Error summarizing conversation {index}: {str(e)}")
+                    return index, None, str(e)
+
+        tasks = [asyncio.create_task(summarize(i, c)) for i, c in enumerate(conversations)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # Stop outstanding work if the consumer goes away (e.g. client disconnect)
+            for task in tasks:
+                task.cancel()
+
     async def extract_action_items(self, conversation: List[Dict]) -> str:
         """Extract action items from a conversation using OpenAI."""
         try:
-            formatted_conversation = "\n".join([
-                f"{msg.get('user', 'Unknown')}: {msg.get('text', '')}"
-                for msg in conversation
-            ])
+            formatted_conversation = await self._format_conversation(conversation)
 
             response = await self.client.chat.completions.create(
                 model="gpt-4",
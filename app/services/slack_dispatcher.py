@@ -0,0 +1,319 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+from slack_sdk.errors import SlackApiError
+
+# Web API tier limits in requests per minute (https://api.slack.com/docs/rate-limits)
+TIER_RATES = {1: 1, 2: 20, 3: 50, 4: 100}
+# chat.postMessage is a "special" tier limited per channel (~1 msg/s), which the
+# channel buckets enforce; it gets no workspace-wide bucket and relies on Retry-After
+CHANNEL_LIMITED_METHODS = {"chat.postMessage"}
+METHOD_TIERS = {
+    "chat.postEphemeral": 4,
+    "chat.update": 3,
+    "chat.delete": 3,
+    "reactions.add": 3,
+    "files.upload": 2,
+}
+DEFAULT_TIER = 3
+# How many supersede keys (threads) to remember the newest ordering key for
+MAX_TRACKED_KEYS = 10000
+
+
+class TokenBucket:
+    """Token bucket that also honours server-imposed pauses (Retry-After)."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _wait_time(self) -> float:
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        while True:
+            wait = self._wait_time()
+            if wait <= 0:
+                self.tokens -= 1
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Block the bucket for the given number of seconds.
+
+        Exactly one token is available when the block ends, so a retry fires
+        as soon as Slack allows it.
+        """
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = min(1, self.capacity)
+        self.updated = self.blocked_until
+
+
+@dataclass
+class OutboundMessage:
+    method: str
+    channel: str
+    kwargs: Dict
+    future: asyncio.Future
+    key: Optional[Tuple] = None
+    order: Any = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+class SlackDispatcher:
+    """Queues outbound Slack API calls and sends them within Slack's rate limits.
+
+    Each channel has its own FIFO queue drained by a worker task that waits on
+    a per-channel bucket (~1 msg/s) and, for tiered methods, a per-method
+    bucket. Messages sent with a supersede key replace any not-yet-sent
+    message with the same key.
+    """
+
+    def __init__(self, client, channel_rate: float = 1.0, channel_burst: float = 1, max_retries: int = 3):
+        # client is a Slack WebClient (sync or async)
+        self.client = client
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self.max_retries = max_retries
+        self._queues: Dict[str, Deque[OutboundMessage]] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        # Sends that have started; close() lets these finish rather than cancelling them
+        self._sending: Set[asyncio.Task] = set()
+        self._pending: Dict[Tuple, OutboundMessage] = {}
+        self._latest_order: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._closed = False
+        self._channel_buckets: Dict[str, TokenBucket] = {}
+        self._method_buckets: Dict[str, TokenBucket] = {}
+        self._delays: Deque[float] = deque(maxlen=1000)
+        self._counters = {
+            "sent": 0, "failed": 0, "superseded": 0, "stale_dropped": 0,
+            "rate_limited": 0, "retried": 0, "dropped_at_shutdown": 0
+        }
+        self._delay_count = 0
+        self._delay_total = 0.0
+        self._delay_max = 0.0
+
+    def post_message(self, channel: str, text: str, thread_ts: Optional[str] = None,
+                     supersede: bool = False, order: Any = None, **kwargs) -> asyncio.Future:
+        """Queue a chat.postMessage call.
+
+        With supersede=True a queued reply to the same thread is replaced, so
+        only the latest one is posted. order (e.g. the triggering event's ts
+        as a Decimal) decides which reply is latest when replies are produced
+        out of order; replies older than one already seen are dropped.
+        """
+        if thread_ts is not None:
+            kwargs["thread_ts"] = thread_ts
+        supersede_key = thread_ts if supersede and thread_ts is not None else None
+        return self.enqueue(
+            "chat.postMessage", channel, supersede_key=supersede_key, order=order, text=text, **kwargs
+        )
+
+    def enqueue(self, method: str, channel: str, supersede_key: Optional[str] = None,
+                order: Any = None, **kwargs) -> asyncio.Future:
+        """Queue a Web API call; the returned future resolves with Slack's response."""
+        if self._closed:
+            raise RuntimeError("SlackDispatcher is closed")
+        key = (method, channel, supersede_key) if supersede_key is not None else None
+
+        if key is not None and order is not None:
+            latest = self._latest_order.get(key)
+            if latest is not None and order < latest:
+                # A reply for a newer event has already been queued or sent
+                self._counters["stale_dropped"] += 1
+                pending = self._pending.get(key)
+                if pending is not None:
+                    return pending.future
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(None)
+                return future
+            self._latest_order[key] = order
+            self._latest_order.move_to_end(key)
+            while len(self._latest_order) > MAX_TRACKED_KEYS:
+                self._latest_order.popitem(last=False)
+
+        if key is not None and key in self._pending:
+            message = self._pending[key]
+            message.kwargs = kwargs
+            message.order = order
+            self._counters["superseded"] += 1
+            return message.future
+
+        future = asyncio.get_running_loop().create_future()
+        # Callers may fire and forget; failures are already printed
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        message = OutboundMessage(method=method, channel=channel, kwargs=kwargs, future=future, key=key, order=order)
+        self._queues.setdefault(channel, deque()).append(message)
+        if key is not None:
+            self._pending[key] = message
+        if channel not in self._workers:
+            self._workers[channel] = asyncio.create_task(self._run_channel(channel))
+        return future
+
+    async def _run_channel(self, channel: str):
+        """Drain one channel's queue in order, respecting rate limits."""
+        queue = self._queues[channel]
+        try:
+            while queue:
+                # The head stays supersedable while it waits for a token
+                await self._channel_bucket(channel).acquire()
+                method_bucket = self._method_bucket(queue[0].method)
+                if method_bucket is not None:
+                    await method_bucket.acquire()
+                message = queue.popleft()
+                if message.key is not None and self._pending.get(message.key) is message:
+                    del self._pending[message.key]
+                # A sync client's send runs in a thread that cannot be cancelled, so
+                # shield it: cancelling the worker must not mark a delivered message dropped
+                send = asyncio.ensure_future(self._send(message, queue))
+                self._sending.add(send)
+                send.add_done_callback(self._sending.discard)
+                await asyncio.shield(send)
+        finally:
+            del self._workers[channel]
+            if not queue:
+                self._queues.pop(channel, None)
+
+    async def _send(self, message: OutboundMessage, queue: Deque[OutboundMessage]):
+        """Send a message, re-queueing it at the head if Slack asks us to back off."""
+        message.attempts += 1
+        try:
+            response = await self._call(message)
+        except SlackApiError as e:
+            if e.response.status_code == 429:
+                self._counters["rate_limited"] += 1
+            if e.response.status_code == 429 and message.attempts <= self.max_retries:
+                retry_after = self._retry_after(e.response)
+                print(f"Slack rate limited {message.method} in {message.channel}; retrying in {retry_after}s")
+                self._channel_bucket(message.channel).pause(retry_after)
+                method_bucket = self._method_bucket(message.method)
+                if method_bucket is not None:
+                    method_bucket.pause(retry_after)
+                newer = self._pending.get(message.key) if message.key is not None else None
+                if newer is not None:
+                    # A newer reply for this thread is already queued; drop the stale one
+                    self._counters["superseded"] += 1
+                    newer.future.add_done_callback(lambda f: self._resolve_from(message.future, f))
+                    return
+                self._counters["retried"] += 1
+                queue.appendleft(message)
+                if message.key is not None:
+                    self._pending[message.key] = message
+                return
+            self._fail(message, e)
+        except Exception as e:
+            self._fail(message, e)
+        else:
+            # Queue delay covers rate-limit waits and any 429 back-off before this send
+            self._record_delay(time.monotonic() - message.enqueued_at)
+            self._counters["sent"] += 1
+            if not message.future.done():
+                message.future.set_result(response)
+
+    async def _call(self, message: OutboundMessage):
+        call = getattr(self.client, message.method.replace(".", "_"))
+        if asyncio.iscoroutinefunction(call):
+            return await call(channel=message.channel, **message.kwargs)
+        return await asyncio.to_thread(call, channel=message.channel, **message.kwargs)
+
+    @staticmethod
+    def _resolve_from(future: asyncio.Future, source: asyncio.Future):
+        if future.done():
+            return
+        if source.cancelled():
+            future.cancel()
+        elif source.exception() is not None:
+            future.set_exception(source.exception())
+        else:
+            future.set_result(source.result())
+
+    def _fail(self, message: OutboundMessage, error: Exception):
+        print(f"Error sending {message.method} to {message.channel}: {str(error)}")
+        self._record_delay(time.monotonic() - message.enqueued_at)
+        self._counters["failed"] += 1
+        if not message.future.done():
+            message.future.set_exception(error)
+
+    @staticmethod
+    def _retry_after(response) -> float:
+        headers = {k.lower(): v for k, v in (response.headers or {}).items()}
+        try:
+            return max(float(headers.get("retry-after", 1)), 0.0)
+        except (TypeError, ValueError):
+            return 1.0
+
+    def _channel_bucket(self, channel: str) -> TokenBucket:
+        if channel not in self._channel_buckets:
+            self._channel_buckets[channel] = TokenBucket(self.channel_rate, self.channel_burst)
+        return self._channel_buckets[channel]
+
+    def _method_bucket(self, method: str) -> Optional[TokenBucket]:
+        if method in CHANNEL_LIMITED_METHODS:
+            return None
+        if method not in self._method_buckets:
+            per_minute = TIER_RATES[METHOD_TIERS.get(method, DEFAULT_TIER)]
+            self._method_buckets[method] = TokenBucket(per_minute / 60, max(1, per_minute // 10))
+        return self._method_buckets[method]
+
+    def _record_delay(self, delay: float):
+        self._delays.append(delay)
+        self._delay_count += 1
+        self._delay_total += delay
+        self._delay_max = max(self._delay_max, delay)
+
+    async def close(self, timeout: float = 5.0):
+        """Stop accepting messages, flush queues for up to timeout seconds, then drop the rest.
+
+        Only messages that never started sending are dropped; in-flight sends finish.
+        """
+        self._closed = True
+        workers = list(self._workers.values())
+        if workers:
+            await asyncio.wait(workers, timeout=timeout)
+
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        # Sends already in progress complete (or re-queue on 429) before counting drops
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+
+        dropped = [message for queue in self._queues.values() for message in queue]
+        if dropped:
+            print(f"Dropping {len(dropped)} queued Slack message(s) at shutdown: " + ", ".join(
+                f"{message.method} to {message.channel}" for message in dropped
+            ))
+        for message in dropped:
+            self._counters["dropped_at_shutdown"] += 1
+            message.future.cancel()
+        self._queues.clear()
+        self._pending.clear()
+
+    def get_metrics(self) -> Dict:
+        """Queue depth, delivery counters and queue delay statistics (seconds)."""
+        recent = sorted(self._delays)
+        return {
+            "queued": sum(len(queue) for queue in self._queues.values()),
+            **self._counters,
+            "queue_delay": {
+                "avg": self._delay_total / self._delay_count if self._delay_count else 0.0,
+                "max": self._delay_max,
+                "p50": recent[len(recent) // 2] if recent else 0.0,
+                "p95": recent[int(len(recent) * 0.95)] if recent else 0.0,
+            },
+        }
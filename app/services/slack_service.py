@@ -1,19 +1,14 @@
 from slack_bolt import App
 from slack_bolt.adapter.fastapi import SlackRequestHandler
 import os
-from typing import Dict, List
+from decimal import Decimal
+from typing import Dict, List, Optional
 from .openai_service import OpenAIService
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from .slack_dispatcher import SlackDispatcher
+from .transcript_service import TranscriptService
 
 class SlackService:
-    def __init__(self):
-        # Debug: Print environment variables
-        print("SLACK_BOT_TOKEN:", os.getenv("SLACK_BOT_TOKEN"))
-        print("SLACK_SIGNING_SECRET:", os.getenv("SLACK_SIGNING_SECRET"))
-
+    def __init__(self, openai_service: Optional[OpenAIService] = None):
         # Verify required environment variables
         if not os.getenv("SLACK_BOT_TOKEN"):
             raise ValueError("SLACK_BOT_TOKEN environment variable is not set")
@@ -23,20 +18,30 @@ class SlackService:
         # Initialize Slack app with explicit token
         self.app = App(
             token=os.getenv("SLACK_BOT_TOKEN"),
-            signing_secret=os.getenv("SLACK_SIGNING_SECRET")
+            signing_secret=os.getenv("SLACK_SIGNING_SECRET"),
+            # auth.test is a network round trip on every worker start; opt in explicitly
+            token_verification_enabled=os.getenv("SLACK_TOKEN_VERIFICATION", "false").lower() == "true"
         )
         self.handler = SlackRequestHandler(self.app)
-        self.openai_service = OpenAIService()
+        # Share one user-name cache between summaries and action items
+        self.openai_service = openai_service or OpenAIService(
+            transcript_service=TranscriptService(self.app.client)
+        )
+        self.transcript_service = self.openai_service.transcript_service
+        # All outbound posts go through the dispatcher so bursts respect Slack's rate limits
+        self.dispatcher = SlackDispatcher(self.app.client)
         
         # Register event handlers
         self.app.message(self.handle_message)
         self.app.event("app_mention")(self.handle_mention)
 
-    async def handle_message(self, event: Dict, say):
+    async def handle_message(self, event: Dict):
         """Handle incoming messages and process them for summarization and action items."""
+        # Replies inside a thread share the parent's thread_ts
+        thread_ts = event.get("thread_ts", event["ts"])
         try:
             # Get conversation history
-            conversation = await self.get_conversation_history(event["channel"], event["ts"])
+            conversation = await self.get_conversation_history(event["channel"], thread_ts)
             
             # Generate summary using OpenAI
             summary = await self.openai_service.summarize_conversation(conversation)
@@ -44,17 +49,24 @@ class SlackService:
             # Extract action items
             action_items = await self.openai_service.extract_action_items(conversation)
             
-            # Post summary and action items in thread
-            await say(
+            # Post summary and action items in thread, replacing any summary still queued
+            self.dispatcher.post_message(
+                channel=event["channel"],
                 text=f"*Conversation Summary:*\n{summary}\n\n*Action Items:*\n{action_items}",
-                thread_ts=event["ts"]
+                thread_ts=thread_ts,
+                supersede=True,
+                # Concurrent runs can finish out of order; only the newest event's summary wins
+                order=Decimal(event["ts"])
             )
             
         except Exception as e:
             print(f"Error handling message: {str(e)}")
-            await say(text="Sorry, I encountered an error processing your message.")
+            self.dispatcher.post_message(
+                channel=event["channel"],
+                text="Sorry, I encountered an error processing your message."
+            )
 
-    async def handle_mention(self, event: Dict, say):
+    async def handle_mention(self, event: Dict):
         """Handle when the bot is mentioned in a channel."""
         try:
             # Get the message text
@@ -64,14 +76,18 @@ class SlackService:
             suggestions = await self.openai_service.generate_suggestions(message)
             
             # Post suggestions in thread
-            await say(
+            self.dispatcher.post_message(
+                channel=event["channel"],
                 text=f"*Here are some suggestions:*\n{suggestions}",
                 thread_ts=event["ts"]
             )
             
         except Exception as e:
             print(f"Error handling mention: {str(e)}")
-            await say(text="Sorry, I encountered an error processing your mention.")
+            self.dispatcher.post_message(
+                channel=event["channel"],
+                text="Sorry, I encountered an error processing your mention."
+            )
 
     async def get_conversation_history(self, channel: str, ts: str) -> List[Dict]:
         """Retrieve conversation history for a given channel and timestamp."""
@@ -88,7 +104,7 @@ class SlackService:
     async def send_daily_digest(self, channel: str, digest_content: str):
         """Send daily digest to a specified channel."""
         try:
-            await self.app.client.chat_postMessage(
+            await self.dispatcher.post_message(
                 channel=channel,
                 text=f"*Daily Digest*\n{digest_content}",
                 blocks=[
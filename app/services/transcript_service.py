@@ -0,0 +1,221 @@
+import asyncio
+import html
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from slack_sdk.errors import SlackApiError
+
+# Slack user IDs look like U024BE7LH (or W... for Enterprise Grid users)
+USER_ID_RE = re.compile(r"^[UW][A-Z0-9]{2,}$")
+USER_MENTION_RE = re.compile(r"<@([UW][A-Z0-9]+)(?:\|([^>]*))?>")
+CHANNEL_MENTION_RE = re.compile(r"<#([CG][A-Z0-9]+)(?:\|([^>]*))?>")
+SPECIAL_MENTION_RE = re.compile(r"<!([^>|]+)(?:\|([^>]*))?>")
+# Only real Slack links; plain text such as "a < b" or "List<String>" is left alone
+LINK_RE = re.compile(r"<((?:https?|mailto|tel):[^>|\s]+)(?:\|([^>]*))?>")
+LINK_SCHEME_RE = re.compile(r"^(?:mailto|tel):")
+CODE_FENCE_RE = re.compile(r"```[a-zA-Z0-9_+-]*\n?")
+# Emoji codes must contain a letter so timestamps such as 10:30:45 survive, and must
+# stand on their own so paths and log lines like a:b:c or ERROR:root:msg are left alone
+EMOJI_RE = re.compile(r"(?<![\w/]):(?:[+-]1|(?=[a-z0-9_+'-]*[a-z])[a-z0-9_+'-]+):(?::skin-tone-\d:)?(?![\w/])")
+URL_TOKEN_RE = re.compile(r"://|^www\.")
+# users.info errors that mean the ID will not resolve; anything else may be transient
+DEFINITIVE_LOOKUP_ERRORS = {"user_not_found", "user_not_visible"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of prompt tokens for a piece of text."""
+    # ~4 characters per token is OpenAI's rule of thumb for English text
+    return (len(text) + 3) // 4
+
+
+class UserCache:
+    """LRU cache of Slack user ID -> display name with a per-entry TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, user_id: str) -> Optional[str]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        name, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return name
+
+    def set(self, user_id: str, name: str, ttl: Optional[float] = None):
+        self._entries[user_id] = (name, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class Transcript:
+    text: str
+    raw_tokens: int
+    tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.raw_tokens - self.tokens, 0)
+
+
+class TranscriptService:
+    """Turns Slack messages into a compact plain-text transcript for prompts."""
+
+    def __init__(self, client=None, cache: Optional[UserCache] = None, max_concurrency: int = 8,
+                 failure_ttl: float = 300.0):
+        # client is a Slack WebClient (sync or async); without one user IDs are left as-is
+        self.client = client
+        self.cache = cache if cache is not None else UserCache()
+        self.max_concurrency = max_concurrency
+        # Unresolvable IDs (deleted or external users) are remembered briefly as ""
+        self.failure_ttl = failure_ttl
+        # Lookups already running, shared by concurrent transcripts
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"requests": 0, "raw_tokens": 0, "tokens": 0, "tokens_saved": 0}
+
+    async def build_transcript(self, conversation: List[Dict]) -> Transcript:
+        """Resolve user names, strip Slack markup and format one line per message."""
+        raw_text = "\n".join([
+            f"{msg.get('user', 'Unknown')}: {msg.get('text', '')}"
+            for msg in conversation
+        ])
+
+        self._seed_from_profiles(conversation)
+        names = await self.resolve_users(self._collect_user_ids(conversation))
+
+        lines = []
+        for msg in conversation:
+            text = self.normalize_text(msg.get("text", ""), names)
+            if not text:
+                continue
+            user = msg.get("user", "Unknown")
+            lines.append(f"{names.get(user, user)}: {text}")
+        text = "\n".join(lines)
+
+        transcript = Transcript(text=text, raw_tokens=estimate_tokens(raw_text), tokens=estimate_tokens(text))
+        self.stats["requests"] += 1
+        self.stats["raw_tokens"] += transcript.raw_tokens
+        self.stats["tokens"] += transcript.tokens
+        self.stats["tokens_saved"] += transcript.tokens_saved
+        return transcript
+
+    async def resolve_users(self, user_ids: Iterable[str]) -> Dict[str, str]:
+        """Map user IDs to display names, fetching cache misses concurrently."""
+        names = {}
+        misses = []
+        for user_id in set(user_ids):
+            name = self.cache.get(user_id)
+            if name is None:
+                misses.append(user_id)
+            elif name:
+                names[user_id] = name
+
+        if misses and self.client is not None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def fetch(user_id: str):
+                future = self._in_flight.get(user_id)
+                if future is None:
+                    future = asyncio.ensure_future(self._fetch_user_name(user_id, semaphore))
+                    self._in_flight[user_id] = future
+                    future.add_done_callback(lambda f: self._in_flight.pop(user_id, None))
+                # Shield so one caller going away does not cancel a lookup others await
+                return user_id, await asyncio.shield(future)
+
+            for user_id, name in await asyncio.gather(*[fetch(user_id) for user_id in misses]):
+                if name:
+                    names[user_id] = name
+
+        return names
+
+    async def _fetch_user_name(self, user_id: str, semaphore: asyncio.Semaphore) -> Optional[str]:
+        """Look up a single user's display name via users.info and cache the outcome."""
+        async with semaphore:
+            try:
+                if asyncio.iscoroutinefunction(self.client.users_info):
+                    result = await self.client.users_info(user=user_id)
+                else:
+                    result = await asyncio.to_thread(self.client.users_info, user=user_id)
+                name = self._display_name(result["user"])
+            except SlackApiError as e:
+                print(f"Error looking up Slack user {user_id}: {str(e)}")
+                # Rate limits and other transient errors are retried on the next transcript
+                if e.response.get("error") in DEFINITIVE_LOOKUP_ERRORS:
+                    self.cache.set(user_id, "", ttl=self.failure_ttl)
+                return None
+            except Exception as e:
+                print(f"Error looking up Slack user {user_id}: {str(e)}")
+                return None
+
+        self.cache.set(user_id, name or "", ttl=None if name else self.failure_ttl)
+        return name
+
+    def _seed_from_profiles(self, conversation: List[Dict]):
+        """Cache names from user_profile blocks Slack already sent with the messages."""
+        for msg in conversation:
+            profile = msg.get("user_profile")
+            user_id = msg.get("user")
+            if isinstance(profile, dict) and user_id:
+                name = self._display_name({"profile": profile, "name": profile.get("name")})
+                if name:
+                    self.cache.set(user_id, name)
+
+    @staticmethod
+    def _display_name(user: Dict) -> Optional[str]:
+        profile = user.get("profile") or {}
+        return (
+            profile.get("display_name")
+            or profile.get("real_name")
+            or user.get("real_name")
+            or user.get("name")
+        )
+
+    @staticmethod
+    def _collect_user_ids(conversation: List[Dict]) -> List[str]:
+        user_ids = []
+        for msg in conversation:
+            user = msg.get("user")
+            if isinstance(user, str) and USER_ID_RE.match(user):
+                user_ids.append(user)
+            user_ids.extend(
+                user_id
+                for user_id, label in USER_MENTION_RE.findall(str(msg.get("text") or ""))
+                if not label
+            )
+        return user_ids
+
+    @staticmethod
+    def normalize_text(text: str, names: Optional[Dict[str, str]] = None) -> str:
+        """Convert Slack mrkdwn into compact plain text."""
+        if text is None:
+            return ""
+        # Non-string payloads (e.g. numbers from the API) are stringified like the baseline did
+        text = str(text)
+        names = names or {}
+
+        text = USER_MENTION_RE.sub(lambda m: "@" + (m.group(2) or names.get(m.group(1), m.group(1))), text)
+        text = CHANNEL_MENTION_RE.sub(lambda m: "#" + (m.group(2) or m.group(1)), text)
+        text = SPECIAL_MENTION_RE.sub(
+            lambda m: m.group(2) or "@" + m.group(1).split("^")[0],
+            text
+        )
+        text = LINK_RE.sub(lambda m: m.group(2) or LINK_SCHEME_RE.sub("", m.group(1)), text)
+        text = CODE_FENCE_RE.sub(" ", text)
+        text = html.unescape(text)
+        tokens = [
+            token if URL_TOKEN_RE.search(token) else EMOJI_RE.sub("", token)
+            for token in text.split()
+        ]
+        return " ".join(token for token in tokens if token)
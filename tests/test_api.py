@@ -43,6 +43,45 @@ def test_summarize():
     assert "summary" in response.json(), f"Expected 'summary' key in response, got {response.json()}"
     print("✅ Summarization endpoint passed")
 
+def test_summarize_batch():
+    """Test the batch summarization endpoint"""
+    data = {
+        "conversations": [
+            {"id": "thread-1", "conversation": [
+                {"user": "user1", "text": "Hello team!"},
+                {"user": "user2", "text": "Hi there!"}
+            ]},
+            {"id": "thread-2", "conversation": [
+                {"user": "user1", "text": "Let's discuss the project timeline"}
+            ]}
+        ],
+        "concurrency": 2
+    }
+    response = requests.post(f"{BASE_URL}/api/summarize/batch", json=data, stream=True)
+    print(f"Batch summarize response: {response.status_code}")
+    assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+    results = [json.loads(line) for line in response.iter_lines() if line]
+    assert sorted(r["id"] for r in results) == ["thread-1", "thread-2"], f"Unexpected batch results: {results}"
+    assert all("summary" in r or "error" in r for r in results), f"Expected 'summary' or 'error' per item, got {results}"
+    print("✅ Batch summarization endpoint passed")
+
+def test_summarize_batch_reports_bad_items():
+    """Test that malformed or empty batch items get per-item errors"""
+    data = {
+        "conversations": [
+            {"id": "bad", "conversation": "notalist"},
+            {"id": "empty", "conversation": []},
+            {"id": "good", "conversation": [{"user": "user1", "text": "Hello team!"}]}
+        ]
+    }
+    response = requests.post(f"{BASE_URL}/api/summarize/batch", json=data, stream=True)
+    print(f"Batch summarize (bad items) response: {response.status_code}")
+    assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+    results = {r["id"]: r for r in (json.loads(line) for line in response.iter_lines() if line)}
+    assert "error" in results["bad"] and "error" in results["empty"], f"Expected per-item errors, got {results}"
+    assert "summary" in results["good"] or "error" in results["good"], f"Unexpected result for good item: {results}"
+    print("✅ Batch summarization per-item errors passed")
+
 def test_action_items():
     """Test the action items endpoint"""
     data = {
@@ -73,6 +112,8 @@ def run_all_tests():
         test_health_check()
         test_slack_events()
         test_summarize()
+        test_summarize_batch()
+        test_summarize_batch_reports_bad_items()
         test_action_items()
         test_daily_digest()
         print("\n🎉 All tests passed!")
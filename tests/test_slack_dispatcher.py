@@ -0,0 +1,207 @@
+import asyncio
+import time
+from decimal import Decimal
+
+import pytest
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
+from app.services.slack_dispatcher import SlackDispatcher, TokenBucket
+
+def rate_limited(retry_after):
+    """Build the SlackApiError the SDK raises for an HTTP 429"""
+    response = SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/chat.postMessage",
+        req_args={},
+        data={"ok": False, "error": "ratelimited"},
+        headers={"Retry-After": str(retry_after)},
+        status_code=429
+    )
+    return SlackApiError("ratelimited", response)
+
+class FakeAsyncClient:
+    """Async chat.postMessage stand-in; `failures` lists errors to raise on successive calls"""
+
+    def __init__(self, failures=None):
+        self.failures = list(failures or [])
+        self.calls = []
+        self.sent = []
+
+    async def chat_postMessage(self, **kwargs):
+        self.calls.append((time.monotonic(), kwargs))
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append((time.monotonic(), kwargs))
+        return {"ok": True, "ts": str(len(self.sent))}
+
+def test_channel_pacing():
+    """Test that one channel gets about 1 msg/s while other channels are not held back"""
+    async def run():
+        client = FakeAsyncClient()
+        dispatcher = SlackDispatcher(client)
+        start = time.monotonic()
+        futures = [dispatcher.post_message("C1", f"msg {i}") for i in range(3)]
+        futures.append(dispatcher.post_message("C2", "other"))
+        await asyncio.gather(*futures)
+        return start, client
+
+    start, client = asyncio.run(run())
+    c1 = [t - start for t, kwargs in client.sent if kwargs["channel"] == "C1"]
+    c2 = [t - start for t, kwargs in client.sent if kwargs["channel"] == "C2"]
+    assert [kwargs["text"] for _, kwargs in client.sent if kwargs["channel"] == "C1"] == ["msg 0", "msg 1", "msg 2"]
+    assert c1[0] < 0.1
+    assert 0.9 < c1[1] - c1[0] < 1.2
+    assert 0.9 < c1[2] - c1[1] < 1.2
+    assert c2[0] < 0.1
+
+def test_many_channels_are_not_serialized():
+    """Test that a burst across channels is limited per channel, not workspace-wide"""
+    async def run():
+        client = FakeAsyncClient()
+        dispatcher = SlackDispatcher(client)
+        start = time.monotonic()
+        await asyncio.gather(*[dispatcher.post_message(f"C{i}", "digest") for i in range(15)])
+        return time.monotonic() - start, client
+
+    elapsed, client = asyncio.run(run())
+    assert len(client.sent) == 15
+    assert elapsed < 0.5, f"15 channels took {elapsed:.2f}s"
+
+def test_supersede_queued_thread_reply():
+    """Test that only the latest queued reply for a thread is posted"""
+    async def run():
+        client = FakeAsyncClient()
+        dispatcher = SlackDispatcher(client, channel_rate=20)
+        # Occupy the channel bucket so the thread replies stay queued
+        first = dispatcher.post_message("C1", "busy")
+        older = dispatcher.post_message("C1", "summary 1", thread_ts="1.0", supersede=True)
+        newer = dispatcher.post_message("C1", "summary 2", thread_ts="1.0", supersede=True)
+        await asyncio.gather(first, older, newer)
+        return client, dispatcher, older, newer
+
+    client, dispatcher, older, newer = asyncio.run(run())
+    assert older is newer
+    assert [kwargs["text"] for _, kwargs in client.sent] == ["busy", "summary 2"]
+    assert dispatcher.get_metrics()["superseded"] == 1
+
+def test_stale_reply_does_not_overwrite_newer_one():
+    """Test that a reply for an older event never replaces or follows a newer one"""
+    async def run():
+        client = FakeAsyncClient()
+        dispatcher = SlackDispatcher(client, channel_rate=20)
+        first = dispatcher.post_message("C1", "busy")
+        newer = dispatcher.post_message("C1", "summary @2", thread_ts="1.0", supersede=True, order=Decimal("2.0"))
+        stale = dispatcher.post_message("C1", "summary @1", thread_ts="1.0", supersede=True, order=Decimal("1.0"))
+        await asyncio.gather(first, newer, stale)
+        # Arrives after the newer summary was already posted
+        late = await dispatcher.post_message("C1", "summary @1.5", thread_ts="1.0", supersede=True, order=Decimal("1.5"))
+        return client, dispatcher, late
+
+    client, dispatcher, late = asyncio.run(run())
+    assert [kwargs["text"] for _, kwargs in client.sent] == ["busy", "summary @2"]
+    assert late is None
+    assert dispatcher.get_metrics()["stale_dropped"] == 2
+
+def test_retry_after_429():
+    """Test that a 429 is retried as soon as Retry-After allows"""
+    async def run():
+        client = FakeAsyncClient(failures=[rate_limited(0.3)])
+        dispatcher = SlackDispatcher(client)
+        result = await dispatcher.post_message("C1", "hello")
+        return client, dispatcher, result
+
+    client, dispatcher, result = asyncio.run(run())
+    assert result["ok"]
+    (first, _), (second, _) = client.calls
+    assert 0.3 <= second - first < 0.5
+    metrics = dispatcher.get_metrics()
+    assert metrics["rate_limited"] == 1 and metrics["retried"] == 1 and metrics["sent"] == 1
+
+def test_failure_after_max_retries():
+    """Test that a message fails once retries are exhausted"""
+    async def run():
+        client = FakeAsyncClient(failures=[rate_limited(0), rate_limited(0), rate_limited(0)])
+        dispatcher = SlackDispatcher(client, max_retries=2)
+        future = dispatcher.post_message("C1", "hello")
+        with pytest.raises(SlackApiError):
+            await future
+        return client, dispatcher
+
+    client, dispatcher = asyncio.run(run())
+    assert len(client.calls) == 3
+    metrics = dispatcher.get_metrics()
+    assert metrics["failed"] == 1 and metrics["rate_limited"] == 3 and metrics["sent"] == 0
+
+def test_queue_delay_includes_backoff():
+    """Test that queue delay metrics count time spent in 429 back-off"""
+    async def run():
+        client = FakeAsyncClient(failures=[rate_limited(0.3)])
+        dispatcher = SlackDispatcher(client)
+        await dispatcher.post_message("C1", "hello")
+        return dispatcher.get_metrics()
+
+    metrics = asyncio.run(run())
+    delay = metrics["queue_delay"]
+    assert delay["max"] >= 0.3
+    assert delay["avg"] == pytest.approx(delay["max"])
+    assert metrics["queued"] == 0
+
+def test_close_flushes_then_drops():
+    """Test that close() sends what it can within the timeout and cancels the rest"""
+    async def run():
+        client = FakeAsyncClient()
+        dispatcher = SlackDispatcher(client)
+        futures = [dispatcher.post_message("C1", f"msg {i}") for i in range(3)]
+        await dispatcher.close(timeout=0.2)
+        with pytest.raises(RuntimeError):
+            dispatcher.post_message("C1", "after close")
+        return client, dispatcher, futures
+
+    client, dispatcher, futures = asyncio.run(run())
+    assert [kwargs["text"] for _, kwargs in client.sent] == ["msg 0"]
+    assert futures[0].result()["ok"]
+    assert all(future.cancelled() for future in futures[1:])
+    assert dispatcher.get_metrics()["dropped_at_shutdown"] == 2
+
+def test_token_bucket_pause_releases_one_token():
+    """Test that a paused bucket allows a call exactly when the pause ends"""
+    async def run():
+        bucket = TokenBucket(rate=1.0, capacity=1)
+        await bucket.acquire()
+        bucket.pause(0.2)
+        start = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - start
+
+    assert 0.19 <= asyncio.run(run()) < 0.35
+
+class SlowSyncClient:
+    """Sync WebClient stand-in whose sends block a worker thread"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.sent = []
+
+    def chat_postMessage(self, **kwargs):
+        time.sleep(self.delay)
+        self.sent.append(kwargs)
+        return {"ok": True}
+
+def test_close_lets_in_flight_sync_send_finish():
+    """Test that a send already running in a thread is not counted as dropped"""
+    async def run():
+        client = SlowSyncClient(delay=0.3)
+        dispatcher = SlackDispatcher(client)
+        futures = [dispatcher.post_message("C1", f"msg {i}") for i in range(2)]
+        await asyncio.sleep(0.05)
+        await dispatcher.close(timeout=0.05)
+        return client, dispatcher, futures
+
+    client, dispatcher, futures = asyncio.run(run())
+    assert [kwargs["text"] for kwargs in client.sent] == ["msg 0"]
+    assert futures[0].result()["ok"]
+    assert futures[1].cancelled()
+    metrics = dispatcher.get_metrics()
+    assert metrics["sent"] == 1 and metrics["dropped_at_shutdown"] == 1
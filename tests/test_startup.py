@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Generous default so slow CI machines pass; tighten locally with STARTUP_BUDGET_SECONDS
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3.0"))
+RUNS = int(os.getenv("STARTUP_BENCH_RUNS", "3"))
+
+HEAVY_MODULES = ["slack_bolt", "slack_sdk", "openai", "notion_client", "googleapiclient", "google_auth_oauthlib"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+def import_app():
+    """Import app.main in a fresh interpreter without credentials and return the probe output"""
+    env = {k: v for k, v in os.environ.items() if not k.startswith(("SLACK_", "OPENAI_", "NOTION_", "GOOGLE_"))}
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    assert result.returncode == 0, f"Importing app.main failed:\n{result.stderr}"
+    lines = result.stdout.strip().splitlines()
+    probe = json.loads(lines[-1])
+    probe["output"] = lines[:-1]
+    return probe
+
+def test_import_is_side_effect_free():
+    """Test that importing the app does not load upstream SDKs or print anything"""
+    probe = import_app()
+    loaded = [name for name in HEAVY_MODULES if name in probe["modules"]]
+    assert not loaded, f"SDKs imported at startup: {loaded}"
+    assert not probe["output"], f"Unexpected output at startup: {probe['output']}"
+    print("✅ Startup imports passed")
+
+def test_startup_time():
+    """Benchmark cold import time of app.main"""
+    timings = sorted(import_app()["elapsed"] for _ in range(RUNS))
+    best = timings[0]
+    print(f"app.main import: best {best * 1000:.1f} ms, worst {timings[-1] * 1000:.1f} ms over {RUNS} runs")
+    assert best < STARTUP_BUDGET_SECONDS, f"Startup took {best:.2f}s, budget is {STARTUP_BUDGET_SECONDS:.2f}s"
+    print("✅ Startup time passed")
+
+if __name__ == "__main__":
+    test_import_is_side_effect_free()
+    test_startup_time()
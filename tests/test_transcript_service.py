@@ -0,0 +1,164 @@
+import asyncio
+import time
+
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
+from app.services.transcript_service import TranscriptService, UserCache
+
+def slack_error(error, status_code=200):
+    """Build the SlackApiError the SDK raises for a failed Web API call"""
+    response = SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/users.info",
+        req_args={},
+        data={"ok": False, "error": error},
+        headers={},
+        status_code=status_code
+    )
+    return SlackApiError(error, response)
+
+class FakeSlackClient:
+    """Async users.info stand-in that records lookups"""
+
+    def __init__(self, names, delay=0.01, error="user_not_found"):
+        self.names = names
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def users_info(self, user):
+        self.calls.append(user)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if user not in self.names:
+                raise slack_error(self.error, 429 if self.error == "ratelimited" else 200)
+            return {"user": {"name": user.lower(), "profile": {"display_name": self.names[user]}}}
+        finally:
+            self.in_flight -= 1
+
+def test_normalize_mentions_and_links():
+    """Test that mentions, channels and links collapse to plain text"""
+    text = "hey <@U1AB> and <@U2CD|bob> in <#C123|general> <!here> see <https://x.com/doc|the doc> or <https://x.com/raw> <mailto:a@b.co|a@b.co>"
+    result = TranscriptService.normalize_text(text, {"U1AB": "alice"})
+    assert result == "hey @alice and @bob in #general @here see the doc or https://x.com/raw a@b.co", result
+
+def test_normalize_leaves_plain_angle_brackets():
+    """Test that only Slack link syntax is rewritten, not comparisons or generics"""
+    assert TranscriptService.normalize_text("if a < b and c > d then ship") == "if a < b and c > d then ship"
+    assert TranscriptService.normalize_text("List<String> x") == "List<String> x"
+    assert TranscriptService.normalize_text("std::vector<int>") == "std::vector<int>"
+    assert TranscriptService.normalize_text("<tel:+15550100|call me>") == "call me"
+
+def test_normalize_non_string_text():
+    """Test that non-string text is stringified instead of raising"""
+    assert TranscriptService.normalize_text(123) == "123"
+    assert TranscriptService.normalize_text(None) == ""
+    transcript = asyncio.run(TranscriptService().build_transcript([{"user": "user1", "text": 123}]))
+    assert transcript.text == "user1: 123"
+
+def test_normalize_fences_and_entities():
+    """Test that code fences are dropped and HTML entities unescaped"""
+    text = "run ```python\nprint(1)\n``` then a &amp; b &lt;3"
+    assert TranscriptService.normalize_text(text) == "run print(1) then a & b <3"
+
+def test_normalize_emoji_only_standalone():
+    """Test that emoji codes are stripped without touching timestamps, URLs or log lines"""
+    assert TranscriptService.normalize_text(":smile::tada: ok :+1::skin-tone-2:") == "ok"
+    assert TranscriptService.normalize_text("at 10:30:45") == "at 10:30:45"
+    assert TranscriptService.normalize_text("see https://host/a:b:c") == "see https://host/a:b:c"
+    assert TranscriptService.normalize_text("https://x.com/?q=:smile:") == "https://x.com/?q=:smile:"
+    assert TranscriptService.normalize_text("ERROR:root:msg failed") == "ERROR:root:msg failed"
+
+def test_user_cache_lru_eviction():
+    """Test that the least recently used entry is evicted first"""
+    cache = UserCache(maxsize=2)
+    cache.set("U1", "a")
+    cache.set("U2", "b")
+    cache.get("U1")
+    cache.set("U3", "c")
+    assert cache.get("U2") is None
+    assert cache.get("U1") == "a" and cache.get("U3") == "c"
+
+def test_user_cache_ttl_expiry():
+    """Test that entries expire after their TTL"""
+    cache = UserCache(ttl=0.05)
+    cache.set("U1", "a")
+    cache.set("U2", "b", ttl=10)
+    assert cache.get("U1") == "a"
+    time.sleep(0.06)
+    assert cache.get("U1") is None
+    assert cache.get("U2") == "b"
+    assert len(cache) == 1
+
+def test_resolve_users_deduplicates_and_runs_concurrently():
+    """Test that repeated IDs are fetched once, concurrently, and then served from cache"""
+    client = FakeSlackClient({"U1AB": "alice", "U2CD": "bob", "U3EF": "carol"})
+    service = TranscriptService(client)
+
+    names = asyncio.run(service.resolve_users(["U1AB", "U2CD", "U1AB", "U3EF", "U2CD"]))
+    assert names == {"U1AB": "alice", "U2CD": "bob", "U3EF": "carol"}
+    assert sorted(client.calls) == ["U1AB", "U2CD", "U3EF"]
+    assert client.max_in_flight > 1
+
+    asyncio.run(service.resolve_users(["U1AB", "U3EF"]))
+    assert len(client.calls) == 3
+
+def test_concurrent_transcripts_share_lookups():
+    """Test that lookups already in flight are awaited instead of repeated"""
+    client = FakeSlackClient({"U1AB": "alice", "U2CD": "bob"}, delay=0.05)
+    service = TranscriptService(client)
+    conversation = [{"user": "U1AB", "text": "hi <@U2CD>"}]
+
+    async def run():
+        return await asyncio.gather(*[service.build_transcript(conversation) for _ in range(10)])
+
+    transcripts = asyncio.run(run())
+    assert all(t.text == "alice: hi @bob" for t in transcripts)
+    assert sorted(client.calls) == ["U1AB", "U2CD"]
+
+def test_transient_lookup_errors_are_not_cached():
+    """Test that a rate-limited lookup is retried on the next transcript"""
+    client = FakeSlackClient({}, delay=0, error="ratelimited")
+    service = TranscriptService(client)
+
+    asyncio.run(service.resolve_users(["U9ZZ"]))
+    client.names["U9ZZ"] = "zed"
+    assert asyncio.run(service.resolve_users(["U9ZZ"])) == {"U9ZZ": "zed"}
+    assert client.calls == ["U9ZZ", "U9ZZ"]
+
+def test_failed_lookups_are_cached_briefly():
+    """Test that an unresolvable user is not looked up again until the failure TTL expires"""
+    client = FakeSlackClient({}, delay=0)
+    service = TranscriptService(client, failure_ttl=0.05)
+
+    assert asyncio.run(service.resolve_users(["U9ZZ"])) == {}
+    assert asyncio.run(service.resolve_users(["U9ZZ"])) == {}
+    assert client.calls == ["U9ZZ"]
+
+    time.sleep(0.06)
+    asyncio.run(service.resolve_users(["U9ZZ"]))
+    assert client.calls == ["U9ZZ", "U9ZZ"]
+
+def test_build_transcript_reports_savings():
+    """Test that transcripts use display names, skip empty messages and track savings"""
+    client = FakeSlackClient({"U1AB": "alice"})
+    service = TranscriptService(client)
+    conversation = [
+        {"user": "U1AB", "text": "ship it :rocket: <https://example.com/very/long/path|release notes>"},
+        {"user": "U2CD", "text": "   ", "user_profile": {"display_name": "bob"}},
+        {"user": "user3", "text": "ok"}
+    ]
+
+    transcript = asyncio.run(service.build_transcript(conversation))
+    assert transcript.text == "alice: ship it release notes\nuser3: ok"
+    assert transcript.tokens_saved > 0
+    assert service.stats["requests"] == 1
+    assert service.stats["tokens_saved"] == transcript.tokens_saved
+    # U2CD came with a profile, so it never needed a users.info call
+    assert client.calls == ["U1AB"]